@@ -1,15 +1,27 @@
+import os
 import uuid
-import random
+import secrets
+import time
+import asyncio
+from operator import itemgetter
 from typing import List, Dict, Optional
-from fastapi import FastAPI, HTTPException
+import numpy as np
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-app = FastAPI(title="Set Game Server")
+app = FastAPI(title="Set Game Server", default_response_class=ORJSONResponse)
 
 
 # ==================== Data Models ====================
 
 class Card(BaseModel):
+    """Wire schema of a card, kept for the OpenAPI docs only.
+
+    Game logic never instantiates models: cards live as ids into the
+    module-level _ALL_CARDS table and are serialized as plain dicts.
+    """
     id: int
     count: int
     shape: int
@@ -61,423 +73,456 @@ class BaseResponse(BaseModel):
     exception: Optional[ExceptionResponse] = None
 
 
+# ==================== Card Encoding ====================
+
+def _encode_cards() -> tuple:
+    """Pack each card's four ternary attributes into 4-bit lanes of one int.
+
+    Lane layout: color | shape<<4 | fill<<8 | count<<12, each lane holding
+    the attribute value minus 1 (0..2). Card ids follow the same order as
+    the deck loops, so _CARD_CODES[card_id] is the code of that card.
+    """
+    codes = []
+    for color in [1, 2, 3]:
+        for shape in [1, 2, 3]:
+            for fill in [1, 2, 3]:
+                for count in [1, 2, 3]:
+                    codes.append((color - 1) |
+                                 ((shape - 1) << 4) |
+                                 ((fill - 1) << 8) |
+                                 ((count - 1) << 12))
+    return tuple(codes)
+
+
+_CARD_CODES = _encode_cards()
+
+# Three cards form a set iff every attribute is all-same or all-different,
+# i.e. iff the sum of the three attribute values is divisible by 3. Summing
+# three codes keeps every 4-bit lane below 16 (max 2+2+2=6), so the whole
+# check is one addition plus two byte lookups: _LANE_OK[b] is 1 iff both
+# 4-bit lanes of byte b are divisible by 3.
+_LANE_OK = bytes(
+    1 if (b & 0xF) % 3 == 0 and (b >> 4) % 3 == 0 else 0
+    for b in range(256)
+)
+
+# All 81 possible cards as one immutable (81, 4) array of
+# (color, shape, fill, count) rows, shared by every room; the row index is
+# the card id. Rooms only ever hold arrays of ids into this table.
+_ALL_CARDS = np.array(
+    [[color, shape, fill, count]
+     for color in [1, 2, 3]
+     for shape in [1, 2, 3]
+     for fill in [1, 2, 3]
+     for count in [1, 2, 3]],
+    dtype=np.uint8,
+)
+_ALL_CARDS.setflags(write=False)
+
+# Dict form of every card, built once and shared by all rooms: responses
+# only copy references out of this list instead of building fresh dicts.
+_CARD_DICTS = [
+    {"id": card_id, "count": count, "shape": shape, "fill": fill, "color": color}
+    for card_id, (color, shape, fill, count) in enumerate(_ALL_CARDS.tolist())
+]
+
+
+def _build_third_table() -> np.ndarray:
+    """Tabulate the unique third card completing a set with any two cards.
+
+    Per attribute the completing value is the one making the three values
+    sum to a multiple of 3. _THIRD[a, b] is the id of the card completing
+    {a, b}; the diagonal degenerates to the card itself.
+    """
+    attrs = _ALL_CARDS.astype(np.int16) - 1
+    third = (-(attrs[:, None, :] + attrs[None, :, :])) % 3
+    return (third @ np.array([27, 9, 3, 1])).astype(np.int8)
+
+
+_THIRD = _build_third_table()
+
+# Shared PCG64 generator for deck shuffles; noticeably faster than the
+# legacy np.random.* Mersenne Twister functions.
+_RNG = np.random.default_rng()
+
+
 # ==================== Game Logic ====================
 
 class GameRoom:
     def __init__(self, game_id: int):
         self.game_id = game_id
-        self.deck: List[Card] = []
-        self.field: List[Card] = []
-        self.players: Dict[str, int] = {}  
+        # The deck is a shuffled permutation of card ids; _deck_top counts
+        # how many are still undealt (the deck's top is the array's end).
+        self._deck_ids = _RNG.permutation(81).astype(np.int8)
+        self._deck_top = 81
+        self._field_ids = np.empty(0, dtype=np.int8)
+        self._field_index: Dict[int, int] = {}  # card id -> position in _field_ids
+        self._has_set: Optional[bool] = None  # cached by has_valid_set
+        self._field_json: Optional[bytes] = None  # cached by field_json
+        # Serializes concurrent mutations of this room's field/deck/scores
+        # now that handlers run concurrently on the event loop.
+        self._lock = asyncio.Lock()
+        self.players: Dict[str, dict] = {}  # token -> {"score": int, "name": str}
         self.status = "ongoing"
-        self._initialize_deck()
         self._deal_initial_cards()
 
-    def _initialize_deck(self):
-        """Create a full deck of 81 Set cards."""
-        card_id = 0
-        for color in [1, 2, 3]:
-            for shape in [1, 2, 3]:
-                for fill in [1, 2, 3]:
-                    for count in [1, 2, 3]:
-                        self.deck.append(Card(
-                            id=card_id,
-                            color=color,
-                            shape=shape,
-                            fill=fill,
-                            count=count
-                        ))
-                        card_id += 1
-        random.shuffle(self.deck)
-
     def _deal_initial_cards(self):
         """Deal 12 cards to the field initially."""
-        for _ in range(12):
-            if self.deck:
-                self.field.append(self.deck.pop())
-
-    def add_player(self, access_token: str):
+        self._deal_from_deck(12)
+
+    def _deal_from_deck(self, count: int):
+        """Move up to count cards from the deck top to the field in one slice."""
+        k = min(count, self._deck_top)
+        if k <= 0:
+            return
+        dealt = self._deck_ids[self._deck_top - k:self._deck_top]
+        base = self._field_ids.size
+        self._field_ids = np.concatenate([self._field_ids, dealt])
+        for pos, cid in enumerate(dealt.tolist(), start=base):
+            self._field_index[cid] = pos
+        self._deck_top -= k
+        self._has_set = None
+        self._field_json = None
+
+    def _field_remove(self, card_id: int):
+        """Remove a card from the field in O(1) by swapping with the last."""
+        pos = self._field_index.pop(card_id)
+        last = self._field_ids.size - 1
+        if pos != last:
+            moved = int(self._field_ids[last])
+            self._field_ids[pos] = moved
+            self._field_index[moved] = pos
+        self._field_ids = self._field_ids[:last]
+        self._has_set = None
+        self._field_json = None
+
+    async def add_player(self, access_token: str, nickname: str):
         """Add a player to the game."""
-        if access_token not in self.players:
-            self.players[access_token] = 0
-
-    def get_card_by_id(self, card_id: int) -> Optional[Card]:
-        """Find a card on the field by ID."""
-        for card in self.field:
-            if card.id == card_id:
-                return card
-        return None
-
-    def is_valid_set(self, c1: Card, c2: Card, c3: Card) -> bool:
-        """Check if three cards form a valid set."""
-        def check_property(v1, v2, v3):
-            return (v1 == v2 == v3) or (v1 != v2 and v1 != v3 and v2 != v3)
-
-        return (check_property(c1.color, c2.color, c3.color) and
-                check_property(c1.shape, c2.shape, c3.shape) and
-                check_property(c1.fill, c2.fill, c3.fill) and
-                check_property(c1.count, c2.count, c3.count))
-
-    def pick_set(self, access_token: str, card_ids: List[int]) -> tuple[bool, int]:
+        async with self._lock:
+            if access_token not in self.players:
+                self.players[access_token] = {"score": 0, "name": nickname}
+
+    def has_card(self, card_id: int) -> bool:
+        """Check whether a card is currently on the field."""
+        return card_id in self._field_index
+
+    def field_cards(self) -> List[dict]:
+        """Cards on the field, serialized for the API."""
+        return [_CARD_DICTS[card_id] for card_id in self._field_ids.tolist()]
+
+    def field_json(self) -> bytes:
+        """ORJSON-encoded cards array, cached until the field changes.
+
+        All players poll the same field, so this serializes once per
+        mutation instead of once per /set/field request.
+        """
+        if self._field_json is None:
+            self._field_json = orjson.dumps(self.field_cards())
+        return self._field_json
+
+    def has_valid_set(self) -> bool:
+        """Whether any valid set is present on the field (cached)."""
+        if self._has_set is None:
+            # For each pair, the set is on the field iff the unique third
+            # card is too; _field_index doubles as the membership set.
+            ids = self._field_ids.tolist()
+            n = len(ids)
+            self._has_set = any(
+                int(_THIRD[ids[i], ids[j]]) in self._field_index
+                for i in range(n)
+                for j in range(i + 1, n))
+        return self._has_set
+
+    def is_valid_set(self, id1: int, id2: int, id3: int) -> bool:
+        """Check if three cards (given by id) form a valid set."""
+        s = _CARD_CODES[id1] + _CARD_CODES[id2] + _CARD_CODES[id3]
+        return bool(_LANE_OK[s & 0xFF] and _LANE_OK[s >> 8])
+
+    async def pick_set(self, access_token: str, card_ids: List[int]) -> tuple[bool, int]:
         """
         Attempt to pick a set.
         Returns: (is_valid_set, new_score)
         """
-        if len(card_ids) != 3:
-            return False, self.players[access_token]
+        async with self._lock:
+            player = self.players[access_token]
+
+            if len(card_ids) != 3 or len(set(card_ids)) != 3:
+                return False, player["score"]
 
-        cards = [self.get_card_by_id(cid) for cid in card_ids]
-        if None in cards:
-            return False, self.players[access_token]
+            if not all(self.has_card(cid) for cid in card_ids):
+                return False, player["score"]
 
-        is_set = self.is_valid_set(cards[0], cards[1], cards[2])
+            is_set = self.is_valid_set(card_ids[0], card_ids[1], card_ids[2])
 
-        if is_set:
+            if is_set:
 
-            for card in cards:
-                self.field.remove(card)
+                for cid in card_ids:
+                    self._field_remove(cid)
 
-            self.players[access_token] += 1
+                player["score"] += 1
 
-            while len(self.field) < 12 and self.deck:
-                self.field.append(self.deck.pop())
+                self._deal_from_deck(12 - self._field_ids.size)
 
-            if not self.deck and len(self.field) < 3:
-                self.status = "ended"
-        else:
-            self.players[access_token] -= 1
+                if self._deck_top == 0 and self._field_ids.size < 3:
+                    self.status = "ended"
+            else:
+                player["score"] -= 1
 
-        return is_set, self.players[access_token]
+            return is_set, player["score"]
 
-    def add_cards(self):
+    async def add_cards(self):
         """Add 3 more cards to the field."""
-        for _ in range(3):
-            if self.deck:
-                self.field.append(self.deck.pop())
+        async with self._lock:
+            self._deal_from_deck(3)
+
+    async def field_state(self, access_token: str) -> tuple:
+        """(cards JSON, status, has-set flag, caller's score) for /set/field."""
+        player = self.players.get(access_token)
+        score = player["score"] if player else 0
+        return self.field_json(), self.status, self.has_valid_set(), score
+
+    async def scores(self) -> List[dict]:
+        """Leaderboard of this room, best score first."""
+        return sorted(
+            ({"name": p["name"], "score": p["score"]} for p in self.players.values()),
+            key=itemgetter("score"), reverse=True)
 
 
 # ==================== Server State ====================
 
 class ServerState:
     def __init__(self):
-        self.users: Dict[str, Dict] = {}  
-        self.games: Dict[int, GameRoom] = {}  
+        self.users: Dict[str, Dict] = {}
+        self.games: Dict[int, GameRoom] = {}
+        self._token_to_game: Dict[str, GameRoom] = {}
         self.next_game_id = 0
+        # Serializes registrations and game creation across the event loop.
+        self._state_lock = asyncio.Lock()
 
-    def register_user(self, nickname: str, password: str) -> str:
+    async def register_user(self, nickname: str, password: str) -> str:
         """Register a new user and return access token."""
-        access_token = self._generate_token()
-        self.users[access_token] = {
-            "nickname": nickname,
-            "password": password,
-            "current_game_id": None
-        }
-        return access_token
-
-    def verify_token(self, access_token: str) -> bool:
+        async with self._state_lock:
+            access_token = self._generate_token()
+            self.users[access_token] = {
+                "nickname": nickname,
+                "password": password,
+                "current_game_id": None
+            }
+            return access_token
+
+    async def verify_token(self, access_token: str) -> bool:
         """Check if access token is valid."""
         return access_token in self.users
 
-    def create_game(self) -> int:
+    async def create_game(self) -> int:
         """Create a new game room and return game ID."""
-        game_id = self.next_game_id
-        self.next_game_id += 1
-        self.games[game_id] = GameRoom(game_id)
-        return game_id
+        async with self._state_lock:
+            game_id = self.next_game_id
+            self.next_game_id += 1
+            self.games[game_id] = GameRoom(game_id)
+            return game_id
 
-    def enter_game(self, access_token: str, game_id: int) -> bool:
+    async def enter_game(self, access_token: str, game_id: int) -> bool:
         """Enter a game room."""
-        if game_id not in self.games:
+        game = self.games.get(game_id)
+        if game is None:
             return False
         self.users[access_token]["current_game_id"] = game_id
-        self.games[game_id].add_player(access_token)
+        self._token_to_game[access_token] = game
+        await game.add_player(access_token, self.users[access_token]["nickname"])
         return True
 
-    def get_user_game(self, access_token: str) -> Optional[GameRoom]:
+    async def get_user_game(self, access_token: str) -> Optional[GameRoom]:
         """Get the game room the user is currently in."""
-        game_id = self.users[access_token].get("current_game_id")
-        if game_id is None:
-            return None
-        return self.games.get(game_id)
+        return self._token_to_game.get(access_token)
+
+    async def list_games(self) -> List[int]:
+        """Ids of all existing game rooms."""
+        return list(self.games.keys())
 
     @staticmethod
     def _generate_token() -> str:
         """Generate a 16-character access token."""
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        return ''.join(random.choice(chars) for _ in range(16))
+        return secrets.token_urlsafe(12)
 
 
-state = ServerState()
+# With REDIS_URL set, state lives in Redis and any worker can serve any
+# room (see redis_state.py); otherwise it is kept in this process.
+if os.environ.get("REDIS_URL"):
+    from redis_state import RedisServerState
+    state = RedisServerState(os.environ["REDIS_URL"])
+else:
+    state = ServerState()
 
 
 # ==================== API Endpoints ====================
 
+# The common error envelopes never change, so build each response once at
+# import time and return the same object; Starlette responses render their
+# body at construction, making these zero-allocation paths.
+_INVALID_TOKEN_RESP = ORJSONResponse(
+    {"success": False, "exception": {"message": "Invalid access token"}})
+_NOT_IN_GAME_RESP = ORJSONResponse(
+    {"success": False, "exception": {"message": "User is not in a game"}})
+_GAME_NOT_FOUND_RESP = ORJSONResponse(
+    {"success": False, "exception": {"message": "Game not found"}})
+
+# Scores are identical for every caller in a room, so concurrent polls are
+# coalesced: within _COALESCE_TTL seconds of a build, the cached body is
+# returned instead of re-sorting and reserializing the leaderboard. The
+# field endpoint needs no TTL because its cache is invalidated exactly on
+# mutation.
+_COALESCE_TTL = 0.05
+_coalesce: Dict[tuple, tuple] = {}  # (endpoint, game_id) -> (expires_at, body)
+
+
+class ApiError(Exception):
+    """Carries a protocol error response out of a dependency."""
+
+    def __init__(self, response: ORJSONResponse):
+        self.response = response
+
+
+@app.exception_handler(ApiError)
+async def _api_error_handler(request: Request, exc: ApiError):
+    return exc.response
+
+
+@app.exception_handler(Exception)
+async def _unhandled_error_handler(request: Request, exc: Exception):
+    """Map any unhandled error to the protocol's failure envelope."""
+    return ORJSONResponse(
+        {"success": False, "exception": {"message": str(exc)}})
+
+
+async def require_game(request: Request) -> tuple:
+    """Resolve the caller's token and current game in one users lookup.
+
+    Shared prologue of the in-game endpoints; the body is cached by
+    Starlette, so reading it here costs no extra parse for the handler.
+    """
+    body = await request.json()
+    access_token = body.get("accessToken")
+    if not await state.verify_token(access_token):
+        raise ApiError(_INVALID_TOKEN_RESP)
+    game = await state.get_user_game(access_token)
+    if game is None:
+        raise ApiError(_NOT_IN_GAME_RESP)
+    return access_token, game
+
 @app.post("/user/register")
-def register(req: RegisterRequest):
+async def register(req: RegisterRequest):
     """Register a new user with nickname and password."""
-    try:
-        access_token = state.register_user(req.nickname, req.password)
-        return {
-            "success": True,
-            "exception": None,
-            "nickname": req.nickname,
-            "accessToken": access_token
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    access_token = await state.register_user(req.nickname, req.password)
+    return {
+        "success": True,
+        "exception": None,
+        "nickname": req.nickname,
+        "accessToken": access_token
+    }
 
 
 @app.post("/set/room/create")
-def create_room(req: CreateRoomRequest):
+async def create_room(req: CreateRoomRequest):
     """Create a new game room."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
+    if not await state.verify_token(req.accessToken):
+        return _INVALID_TOKEN_RESP
 
-        game_id = state.create_game()
-        return {
-            "success": True,
-            "exception": None,
-            "gameId": game_id
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    game_id = await state.create_game()
+    return {
+        "success": True,
+        "exception": None,
+        "gameId": game_id
+    }
 
 
 @app.post("/set/room/list")
-def list_rooms(req: ListRoomRequest):
+async def list_rooms(req: ListRoomRequest):
     """Get list of all game rooms."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
+    if not await state.verify_token(req.accessToken):
+        return _INVALID_TOKEN_RESP
 
-        games = [{"id": game_id} for game_id in state.games.keys()]
-        return {
-            "success": True,
-            "exception": None,
-            "games": games
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    games = [{"id": game_id} for game_id in await state.list_games()]
+    return {
+        "success": True,
+        "exception": None,
+        "games": games
+    }
 
 
 @app.post("/set/room/enter")
-def enter_room(req: EnterRoomRequest):
+async def enter_room(req: EnterRoomRequest):
     """Enter a game room."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
+    if not await state.verify_token(req.accessToken):
+        return _INVALID_TOKEN_RESP
 
-        success = state.enter_game(req.accessToken, req.gameId)
-        if not success:
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Game not found"
-                }
-            }
+    success = await state.enter_game(req.accessToken, req.gameId)
+    if not success:
+        return _GAME_NOT_FOUND_RESP
 
-        return {
-            "success": True,
-            "exception": None,
-            "gameId": req.gameId
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    return {
+        "success": True,
+        "exception": None,
+        "gameId": req.gameId
+    }
 
 
 @app.post("/set/field")
-def get_field(req: FieldRequest):
+async def get_field(req: FieldRequest, ctx: tuple = Depends(require_game)):
     """Get the current field (cards on the table) for the user's game."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
-
-        game = state.get_user_game(req.accessToken)
-        if not game:
-            return {
-                "success": False,
-                "exception": {
-                    "message": "User is not in a game"
-                }
-            }
-
-        score = game.players.get(req.accessToken, 0)
-        return {
-            "success": True,
-            "exception": None,
-            "cards": game.field,
-            "status": game.status,
-            "score": score
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    access_token, game = ctx
+    cards_json, status, has_set, score = await game.field_state(access_token)
+    # Splice the per-player fields around the cached cards fragment so the
+    # card list is only reserialized when the field actually changes.
+    body = (b'{"success":true,"exception":null,"cards":' + cards_json +
+            b',"status":"' + status.encode() +
+            b'","hasSet":' + (b'true' if has_set else b'false') +
+            b',"score":' + str(score).encode() + b'}')
+    return Response(content=body, media_type="application/json")
 
 
 @app.post("/set/pick")
-def pick_set(req: PickRequest):
+async def pick_set(req: PickRequest, ctx: tuple = Depends(require_game)):
     """Attempt to pick a set from the field."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
-
-        game = state.get_user_game(req.accessToken)
-        if not game:
-            return {
-                "success": False,
-                "exception": {
-                    "message": "User is not in a game"
-                }
-            }
-
-        is_set, new_score = game.pick_set(req.accessToken, req.cards)
-        return {
-            "success": True,
-            "exception": None,
-            "isSet": is_set,
-            "score": new_score
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    access_token, game = ctx
+    is_set, new_score = await game.pick_set(access_token, req.cards)
+    return {
+        "success": True,
+        "exception": None,
+        "isSet": is_set,
+        "score": new_score
+    }
 
 
 @app.post("/set/add")
-def add_cards(req: AddCardsRequest):
+async def add_cards(req: AddCardsRequest, ctx: tuple = Depends(require_game)):
     """Add 3 more cards to the field."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
-
-        game = state.get_user_game(req.accessToken)
-        if not game:
-            return {
-                "success": False,
-                "exception": {
-                    "message": "User is not in a game"
-                }
-            }
-
-        game.add_cards()
-        return {
-            "success": True,
-            "exception": None
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    _, game = ctx
+    await game.add_cards()
+    return {
+        "success": True,
+        "exception": None
+    }
 
 
 @app.post("/set/scores")
-def get_scores(req: ScoresRequest):
+async def get_scores(req: ScoresRequest, ctx: tuple = Depends(require_game)):
     """Get scores of all players in the current game."""
-    try:
-        if not state.verify_token(req.accessToken):
-            return {
-                "success": False,
-                "exception": {
-                    "message": "Invalid access token"
-                }
-            }
-
-        game = state.get_user_game(req.accessToken)
-        if not game:
-            return {
-                "success": False,
-                "exception": {
-                    "message": "User is not in a game"
-                }
-            }
+    _, game = ctx
+    key = ("scores", game.game_id)
+    now = time.monotonic()
+    cached = _coalesce.get(key)
+    if cached and cached[0] > now:
+        return Response(content=cached[1], media_type="application/json")
 
-        users = []
-        for token, score in game.players.items():
-            nickname = state.users[token]["nickname"]
-            users.append({
-                "name": nickname,
-                "score": score
-            })
-
-        users.sort(key=lambda x: x["score"], reverse=True)
-
-        return {
-            "success": True,
-            "exception": None,
-            "users": users
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "exception": {
-                "message": str(e)
-            }
-        }
+    users = await game.scores()
+    body = orjson.dumps({"success": True, "exception": None, "users": users})
+    _coalesce[key] = (now + _COALESCE_TTL, body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint with basic info."""
     return {
         "message": "Set Game Server",
@@ -0,0 +1,253 @@
+"""Redis-backed server state for multi-worker deployments.
+
+Selected by setting REDIS_URL (see README); main.py falls back to the
+in-process ServerState otherwise. Users, room membership and all per-room
+game state live in Redis, so any worker can serve any room. The classes
+mirror the async surface of main.ServerState/GameRoom that the endpoint
+handlers use.
+
+pick_set runs as a single Lua script: checking the three cards, validating
+the set, removing them, refilling from the deck and updating the score all
+happen atomically in one round trip, so concurrent picks from different
+workers cannot race.
+
+Key layout:
+    next_game_id          counter of created rooms
+    games                 set of existing game ids
+    user:{token}          hash: nickname, password, current_game_id
+    game:{id}:deck        undealt card ids as raw bytes (deck top at the end)
+    game:{id}:field       field card ids as raw bytes
+    game:{id}:status      "ongoing" | "ended"
+    game:{id}:scores      hash: token -> score
+    game:{id}:names       hash: token -> nickname
+"""
+
+import random
+import secrets
+from operator import itemgetter
+from typing import List, Optional
+
+import orjson
+import redis.asyncio as redis
+
+
+# Dict form of every card, decoded from the base-3 digit layout of card ids
+# ((color, shape, fill, count), most significant first, values 1..3).
+def _card_dict(card_id: int) -> dict:
+    color, rest = divmod(card_id, 27)
+    shape, rest = divmod(rest, 9)
+    fill, count = divmod(rest, 3)
+    return {"id": card_id, "count": count + 1, "shape": shape + 1,
+            "fill": fill + 1, "color": color + 1}
+
+
+_CARD_DICTS = [_card_dict(i) for i in range(81)]
+
+
+def _third_id(a: int, b: int) -> int:
+    """Id of the unique card completing a set with cards a and b."""
+    third = 0
+    for place in (27, 9, 3, 1):
+        third += ((-(a // place) - (b // place)) % 3) * place
+    return third
+
+
+def _has_valid_set(ids: List[int]) -> bool:
+    """Pair-scan a list of field ids for any valid set."""
+    on_field = set(ids)
+    return any(
+        _third_id(ids[i], ids[j]) in on_field
+        for i in range(len(ids))
+        for j in range(i + 1, len(ids)))
+
+
+# KEYS: field, deck, status, scores. ARGV: token, id1, id2, id3.
+# Returns {1, new_score} on a valid set, {0, new_score} otherwise.
+# Validity uses the digit-sum rule: summing the base-3 quotients keeps each
+# attribute digit's contribution intact mod 3, so no digit extraction is
+# needed. Refill preserves the deck-top-at-the-end convention of GameRoom.
+_PICK_LUA = """
+local field = redis.call('GET', KEYS[1]) or ''
+local token = ARGV[1]
+local a = tonumber(ARGV[2])
+local b = tonumber(ARGV[3])
+local c = tonumber(ARGV[4])
+
+for _, id in ipairs({a, b, c}) do
+    if not string.find(field, string.char(id), 1, true) then
+        return {0, redis.call('HINCRBY', KEYS[4], token, 0)}
+    end
+end
+
+for _, place in ipairs({27, 9, 3, 1}) do
+    local s = math.floor(a / place) + math.floor(b / place) + math.floor(c / place)
+    if s % 3 ~= 0 then
+        return {0, redis.call('HINCRBY', KEYS[4], token, -1)}
+    end
+end
+
+local kept = {}
+for i = 1, #field do
+    local id = string.byte(field, i)
+    if id ~= a and id ~= b and id ~= c then
+        kept[#kept + 1] = string.char(id)
+    end
+end
+field = table.concat(kept)
+
+local deck = redis.call('GET', KEYS[2]) or ''
+local need = 12 - #field
+if need > #deck then need = #deck end
+if need > 0 then
+    field = field .. string.sub(deck, #deck - need + 1)
+    deck = string.sub(deck, 1, #deck - need)
+    redis.call('SET', KEYS[2], deck)
+end
+redis.call('SET', KEYS[1], field)
+if #deck == 0 and #field < 3 then
+    redis.call('SET', KEYS[3], 'ended')
+end
+return {1, redis.call('HINCRBY', KEYS[4], token, 1)}
+"""
+
+# KEYS: field, deck. ARGV: count. Moves up to count cards to the field.
+_DEAL_LUA = """
+local deck = redis.call('GET', KEYS[2]) or ''
+local k = tonumber(ARGV[1])
+if k > #deck then k = #deck end
+if k > 0 then
+    local field = redis.call('GET', KEYS[1]) or ''
+    redis.call('SET', KEYS[1], field .. string.sub(deck, #deck - k + 1))
+    redis.call('SET', KEYS[2], string.sub(deck, 1, #deck - k))
+end
+return k
+"""
+
+
+class RedisGameRoom:
+    """Handle to one room's keys; carries no state besides the game id."""
+
+    def __init__(self, client: redis.Redis, pick_script, deal_script, game_id: int):
+        self.game_id = game_id
+        self._redis = client
+        self._pick = pick_script
+        self._deal = deal_script
+        key = f"game:{game_id}"
+        self._field_key = f"{key}:field"
+        self._deck_key = f"{key}:deck"
+        self._status_key = f"{key}:status"
+        self._scores_key = f"{key}:scores"
+        self._names_key = f"{key}:names"
+
+    async def add_player(self, access_token: str, nickname: str):
+        """Add a player to the game."""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hsetnx(self._scores_key, access_token, 0)
+        pipe.hset(self._names_key, access_token, nickname)
+        await pipe.execute()
+
+    async def pick_set(self, access_token: str, card_ids: List[int]) -> tuple:
+        """
+        Attempt to pick a set.
+        Returns: (is_valid_set, new_score)
+        """
+        if len(card_ids) != 3 or len(set(card_ids)) != 3 \
+                or not all(0 <= cid < 81 for cid in card_ids):
+            score = await self._redis.hget(self._scores_key, access_token)
+            return False, int(score or 0)
+        is_set, score = await self._pick(
+            keys=[self._field_key, self._deck_key,
+                  self._status_key, self._scores_key],
+            args=[access_token] + list(card_ids))
+        return bool(is_set), int(score)
+
+    async def add_cards(self):
+        """Add 3 more cards to the field."""
+        await self._deal(keys=[self._field_key, self._deck_key], args=[3])
+
+    async def field_state(self, access_token: str) -> tuple:
+        """(cards JSON, status, has-set flag, caller's score) for /set/field."""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.get(self._field_key)
+        pipe.get(self._status_key)
+        pipe.hget(self._scores_key, access_token)
+        field, status, score = await pipe.execute()
+        ids = list(field or b"")
+        cards_json = orjson.dumps([_CARD_DICTS[cid] for cid in ids])
+        status = (status or b"ongoing").decode()
+        return cards_json, status, _has_valid_set(ids), int(score or 0)
+
+    async def scores(self) -> List[dict]:
+        """Leaderboard of this room, best score first."""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(self._scores_key)
+        pipe.hgetall(self._names_key)
+        score_map, names = await pipe.execute()
+        return sorted(
+            ({"name": names.get(token, b"").decode(), "score": int(score)}
+             for token, score in score_map.items()),
+            key=itemgetter("score"), reverse=True)
+
+
+class RedisServerState:
+    """Drop-in replacement for main.ServerState backed by Redis."""
+
+    def __init__(self, url: str):
+        self._redis = redis.from_url(url)
+        self._pick = self._redis.register_script(_PICK_LUA)
+        self._deal = self._redis.register_script(_DEAL_LUA)
+
+    def _room(self, game_id: int) -> RedisGameRoom:
+        return RedisGameRoom(self._redis, self._pick, self._deal, game_id)
+
+    async def register_user(self, nickname: str, password: str) -> str:
+        """Register a new user and return access token."""
+        access_token = secrets.token_urlsafe(12)
+        await self._redis.hset(f"user:{access_token}", mapping={
+            "nickname": nickname,
+            "password": password,
+        })
+        return access_token
+
+    async def verify_token(self, access_token: str) -> bool:
+        """Check if access token is valid."""
+        if access_token is None:
+            return False
+        return await self._redis.exists(f"user:{access_token}") == 1
+
+    async def create_game(self) -> int:
+        """Create a new game room and return game ID."""
+        game_id = await self._redis.incr("next_game_id") - 1
+        # Same layout as GameRoom: shuffled permutation with the deck top at
+        # the end; the last 12 ids are dealt as the initial field.
+        deck = bytes(random.sample(range(81), 81))
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.sadd("games", game_id)
+        pipe.set(f"game:{game_id}:deck", deck[:-12])
+        pipe.set(f"game:{game_id}:field", deck[-12:])
+        pipe.set(f"game:{game_id}:status", "ongoing")
+        await pipe.execute()
+        return game_id
+
+    async def enter_game(self, access_token: str, game_id: int) -> bool:
+        """Enter a game room."""
+        if not await self._redis.sismember("games", game_id):
+            return False
+        nickname = await self._redis.hget(f"user:{access_token}", "nickname")
+        await self._redis.hset(f"user:{access_token}",
+                               "current_game_id", game_id)
+        room = self._room(game_id)
+        await room.add_player(access_token, (nickname or b"").decode())
+        return True
+
+    async def get_user_game(self, access_token: str) -> Optional[RedisGameRoom]:
+        """Get the game room the user is currently in."""
+        game_id = await self._redis.hget(f"user:{access_token}",
+                                         "current_game_id")
+        if game_id is None:
+            return None
+        return self._room(int(game_id))
+
+    async def list_games(self) -> List[int]:
+        """Ids of all existing game rooms."""
+        return sorted(int(gid) for gid in await self._redis.smembers("games"))
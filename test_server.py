@@ -9,6 +9,7 @@ Tests all protocol requirements:
 6. Viewing scores
 """
 
+import functools
 import requests
 import json
 from typing import Dict, List
@@ -137,26 +138,40 @@ def test_get_field(token: str, player_name: str):
         return None
 
 
+def _third_id(a: int, b: int) -> int:
+    """Id of the unique card completing a set with cards a and b.
+
+    Card ids are base-3 digits in (color, shape, fill, count) order; the
+    completing value makes each attribute's digit sum divisible by 3.
+    """
+    third = 0
+    for place in (27, 9, 3, 1):
+        third += ((-(a // place) - (b // place)) % 3) * place
+    return third
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_valid_set_cached(ids: tuple) -> tuple:
+    """Pair-scan a sorted tuple of field ids for a valid set (memoized)."""
+    on_field = set(ids)
+    for i in range(len(ids)):
+        for j in range(i + 1, len(ids)):
+            third = _third_id(ids[i], ids[j])
+            if third in on_field:
+                return (ids[i], ids[j], third)
+    return None
+
+
 def find_valid_set(cards: List[Dict]) -> List[int]:
     """
     Try to find a valid set from the cards.
-    This is a brute-force check of all 3-card combinations.
+    Any two cards determine a unique third card that completes the set,
+    so it is enough to scan pairs and check whether that third card is
+    on the field. Results are memoized on the (sorted) field ids, so
+    polling an unchanged field costs one cache lookup.
     """
-    def is_valid_set(c1, c2, c3):
-        def check_prop(v1, v2, v3):
-            return (v1 == v2 == v3) or (v1 != v2 and v1 != v3 and v2 != v3)
-        
-        return (check_prop(c1["color"], c2["color"], c3["color"]) and
-                check_prop(c1["shape"], c2["shape"], c3["shape"]) and
-                check_prop(c1["fill"], c2["fill"], c3["fill"]) and
-                check_prop(c1["count"], c2["count"], c3["count"]))
-    
-    for i in range(len(cards)):
-        for j in range(i + 1, len(cards)):
-            for k in range(j + 1, len(cards)):
-                if is_valid_set(cards[i], cards[j], cards[k]):
-                    return [cards[i]["id"], cards[j]["id"], cards[k]["id"]]
-    return None
+    found = _find_valid_set_cached(tuple(sorted(c["id"] for c in cards)))
+    return list(found) if found else None
 
 
 def test_pick_set(token: str, cards: List[Dict], player_name: str):